@@ -5,8 +5,14 @@ Demonstrates how different tiers limit review collection
 """
 
 import json
-from shopify_review_scraper import ShopifyReviewScraper
-from integrate_shopify_scraper import ShopifyIntegrator
+from functools import lru_cache
+
+@lru_cache(maxsize=8)
+def scraper_for(tier):
+    """Build one ShopifyReviewScraper per tier and reuse it."""
+    # Imported here so selenium is only loaded when a scraper is needed
+    from shopify_review_scraper import ShopifyReviewScraper
+    return ShopifyReviewScraper(tier=tier)
 
 def test_tier_limits():
     """Test tier limits with mock data."""
@@ -24,7 +30,7 @@ def test_tier_limits():
         # Test 1: Basic Tier (20 review limit)
         print(f"\n1️⃣ Testing BASIC tier (20 review limit):")
         
-        basic_scraper = ShopifyReviewScraper(tier="basic")
+        basic_scraper = scraper_for("basic")
         print(f"   Scraper tier: {basic_scraper.tier}")
         print(f"   Max reviews: {basic_scraper.max_reviews}")
         
@@ -39,7 +45,7 @@ def test_tier_limits():
         # Test 2: Premium Tier (200 review limit)
         print(f"\n2️⃣ Testing PREMIUM tier (200 review limit):")
         
-        premium_scraper = ShopifyReviewScraper(tier="premium")
+        premium_scraper = scraper_for("premium")
         print(f"   Scraper tier: {premium_scraper.tier}")
         print(f"   Max reviews: {premium_scraper.max_reviews}")
         
@@ -52,6 +58,7 @@ def test_tier_limits():
         # Test 3: Integration with tier limits
         print(f"\n3️⃣ Testing Integration with tier limits:")
         
+        from integrate_shopify_scraper import ShopifyIntegrator
         basic_integrator = ShopifyIntegrator(tier="basic")
         premium_integrator = ShopifyIntegrator(tier="premium")
         
@@ -65,15 +72,16 @@ def test_tier_limits():
         print(f"\n4️⃣ Testing Multi-store with tier limits:")
         
         # Create mock multi-store data with more reviews than basic limit
-        extended_reviews = []
-        for i in range(50):  # Create 50 mock reviews
-            extended_reviews.append({
+        extended_reviews = [
+            {
                 "review_id": f"R{i+1:03d}",
                 "text": f"Mock review {i+1} text content here...",
                 "rating": 5,
                 "reviewer": f"Customer {i+1}",
                 "date": "2024-01-01"
-            })
+            }
+            for i in range(50)  # Create 50 mock reviews
+        ]
         
         print(f"   Mock data: {len(extended_reviews)} reviews available")
         
@@ -88,8 +96,8 @@ def test_tier_limits():
         print(f"\n📊 Tier Comparison Summary:")
         print(f"   BASIC tier:    {basic_scraper.max_reviews} reviews max per site")
         print(f"   PREMIUM tier:  {premium_scraper.max_reviews} reviews max per site")
-        print(f"   ENTERPRISE:    {ShopifyReviewScraper(tier='enterprise').max_reviews} reviews max per site")
-        print(f"   PRO tier:      {ShopifyReviewScraper(tier='pro').max_reviews} reviews max per site")
+        print(f"   ENTERPRISE:    {scraper_for('enterprise').max_reviews} reviews max per site")
+        print(f"   PRO tier:      {scraper_for('pro').max_reviews} reviews max per site")
         
         # Test 5: Data quality with tier limits
         print(f"\n5️⃣ Testing data quality flags:")